@@ -8,19 +8,24 @@ import sys
 import re
 import os
 import json
-import difflib
+import sqlite3
+import hashlib
 import string
 import time
 import nltk
 import heapq
 import math
 from dotenv import load_dotenv
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict, deque
+from functools import lru_cache
+from itertools import chain
 import subprocess
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+from types import SimpleNamespace
+from xml.etree import ElementTree
 from email.utils import parsedate_to_datetime
 import dateutil.parser
-from bs4 import BeautifulSoup  # Added for HTML parsing
 
 # Timezone mapping for abbreviations
 TIMEZONE_MAP = {
@@ -39,7 +44,7 @@ TIMEZONE_MAP = {
 }
 
 # Check and install missing dependencies
-required_libraries = ['pytz', 'colorama', 'python-dateutil', 'beautifulsoup4']
+required_libraries = ['pytz', 'colorama', 'python-dateutil', 'rapidfuzz']
 for lib in required_libraries:
     try:
         __import__(lib)
@@ -49,6 +54,7 @@ for lib in required_libraries:
 
 import pytz
 from colorama import Fore, Style, init
+from rapidfuzz import fuzz, process
 init(autoreset=True)  # Initialize colorama
 
 # Load environment variables
@@ -57,6 +63,16 @@ load_dotenv()
 # User settings file path
 USER_SETTINGS_FILE = 'user_settings.json'
 
+# Posted articles/titles database path
+STATE_DB_FILE = 'state.db'
+
+# Most recently seen article fingerprints kept in the state database
+MAX_POSTED_ARTICLES = 10000
+# How often a fingerprint that is still in a feed has its last-seen time refreshed
+POSTED_ARTICLE_REFRESH_SECONDS = 24 * 60 * 60
+# Recently seen fingerprints answered from memory without a database lookup
+POSTED_ARTICLE_CACHE_SIZE = 2048
+
 # Download required NLTK data
 def download_nltk_resources():
     resources = ['punkt', 'stopwords', 'punkt_tab']
@@ -86,6 +102,43 @@ RSS_FEEDS = {
     "Ground News": "https://rss.app/feeds/SGUPMZoQI5Pc0x31.xml"
 }
 
+# HTML tag pattern used when cleaning descriptions (character class avoids backtracking)
+HTML_TAG_RE = re.compile(r'<[^>]*>')
+# A tag left unclosed where the raw HTML was cut off
+DANGLING_TAG_RE = re.compile(r'<[A-Za-z/!][^<>]*\Z')
+
+# Raw description HTML is cut to this many characters before tags are stripped
+MAX_DESCRIPTION_HTML = 4000
+
+# Only the head of an article page is read when looking for its publication time
+PAGE_HEAD_BYTES = 64 * 1024
+PUBLICATION_TIME_PATTERNS = (
+    re.compile(r'<time\b[^>]*\bdatetime=["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'<meta\b(?=[^>]*\bproperty=["\']article:published_time["\'])[^>]*\bcontent=["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'<meta\b(?=[^>]*\bproperty=["\']og:article:published_time["\'])[^>]*\bcontent=["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z?)'),
+)
+
+# Tracking query parameters stripped when normalizing article URLs
+TRACKING_PARAMS = frozenset({'source', 'fbclid', 'ref', 'igshid', 'gclid', 'yclid'})
+TRACKING_PARAM_PREFIXES = ('utm_', 'mc_')
+
+# Alphanumeric runs picked out as words by the summarizer
+SUMMARY_WORD_RE = re.compile(r'[^\W_]+')
+
+# Publication times are shown as YYYY-MM-DD HH:MM:SS TZ (e.g. EDT/EST)
+PUBLISHED_TIME_FORMAT = '%Y-%m-%d %H:%M:%S %Z'
+
+# Discord accepts up to 10 embeds per message, 6000 characters across all of them
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS = 6000
+# How long shutdown waits for queued articles to be posted
+SHUTDOWN_SEND_TIMEOUT = 30
+
+# Title normalization tables
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+TITLE_STOP_WORDS = frozenset({"the", "a", "an", "in", "on", "at", "to", "for", "with", "and", "but", "or"})
+
 def load_user_settings():
     """Load user settings from file"""
     if Path(USER_SETTINGS_FILE).exists():
@@ -102,8 +155,11 @@ def load_user_settings():
 def save_user_settings(name, timezone):
     """Save user settings to file"""
     try:
-        with open(USER_SETTINGS_FILE, 'w') as f:
+        # Write to a temp file and swap it in so a crash never leaves a truncated file
+        tmp_path = USER_SETTINGS_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
             json.dump({"name": name, "timezone": timezone}, f)
+        os.replace(tmp_path, USER_SETTINGS_FILE)
     except Exception as e:
         logger.error(f"Error saving user settings: {str(e)}")
 
@@ -159,40 +215,113 @@ def get_user_settings():
     print(f"\nSettings saved! Welcome, {name}!")
     return {"name": name, "timezone": timezone}
 
+@lru_cache(maxsize=4096)
+def normalize_title(title):
+    """Normalize title for similarity comparison"""
+    words = title.lower().translate(PUNCTUATION_TABLE).split()
+    return " ".join(word for word in words if word not in TITLE_STOP_WORDS)
+
+@lru_cache(maxsize=2048)
+def parse_datetime(dt_str):
+    """Parse a feed or page timestamp into a UTC datetime, or None if it can't be parsed"""
+    try:
+        # First try RFC 2822 format
+        dt = parsedate_to_datetime(dt_str)
+    except (ValueError, TypeError):
+        try:
+            # Then try ISO 8601 format
+            dt = datetime.fromisoformat(dt_str)
+        except (ValueError, TypeError):
+            try:
+                # Finally use universal parser
+                dt = dateutil.parser.parse(dt_str)
+            except Exception:
+                return None
+    
+    # Ensure datetime is in UTC
+    if dt.tzinfo is None:
+        return pytz.utc.localize(dt)
+    return dt.astimezone(pytz.utc)
+
+class FeedEntry(dict):
+    """Feed item supporting both entry['key'] and entry.key access, like feedparser entries"""
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+# RSS 2.0 item elements and the feedparser keys they map to
+RSS_ITEM_FIELDS = {
+    'title': 'title',
+    'link': 'link',
+    'description': 'description',
+    'pubDate': 'published',
+    '{http://purl.org/dc/elements/1.1/}date': 'updated',
+}
+RSS_CONTENT_TAG = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+def parse_rss(xml):
+    """Parse a plain RSS 2.0 document with the C XML parser, or return None if it is anything else"""
+    try:
+        root = ElementTree.fromstring(xml)
+    except ElementTree.ParseError:
+        return None
+    channel = root.find('channel')
+    if root.tag != 'rss' or channel is None:
+        return None
+    
+    entries = []
+    for item in channel.iter('item'):
+        entry = FeedEntry()
+        for tag, key in RSS_ITEM_FIELDS.items():
+            text = item.findtext(tag)
+            if text and text.strip():
+                entry[key] = text.strip()
+        # Like feedparser, use a permalink guid when the item has no <link>
+        guid = item.find('guid')
+        if 'link' not in entry and guid is not None and guid.get('isPermaLink') != 'false':
+            if guid.text and guid.text.strip():
+                entry['link'] = guid.text.strip()
+        content = item.findtext(RSS_CONTENT_TAG)
+        if content:
+            entry['content'] = [FeedEntry(value=content)]
+        entries.append(entry)
+    return SimpleNamespace(entries=entries)
+
+def parse_feed(xml):
+    """Parse feed bytes, falling back to feedparser for Atom or malformed feeds"""
+    return parse_rss(xml) or feedparser.parse(xml)
+
 class FreeTextSummarizer:
     """Free text summarization using TF-IDF algorithm"""
+    # Loaded once at import, after the NLTK data download above
+    stop_words = frozenset(nltk.corpus.stopwords.words('english'))
+    stemmer = nltk.stem.PorterStemmer()
+    
     def __init__(self):
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
-        self.stemmer = nltk.stem.PorterStemmer()
+        # The same words recur across sentences and articles, so stem each one once
+        self.stem = lru_cache(maxsize=8192)(self.stemmer.stem)
+        # Boilerplate sentences repeat across articles and fetch cycles
+        self.preprocess = lru_cache(maxsize=4096)(self.preprocess)
     
     def preprocess(self, text):
         """Tokenize and clean text"""
-        words = nltk.word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
-        words = [self.stemmer.stem(word) for word in words]
-        return words
+        stop_words = self.stop_words
+        return tuple(self.stem(word) for word in SUMMARY_WORD_RE.findall(text.lower()) if word not in stop_words)
     
     def calculate_sentence_scores(self, sentences):
         """Calculate TF-IDF scores for sentences"""
-        word_freq = defaultdict(int)
-        for sentence in sentences:
-            for word in sentence:
-                word_freq[word] += 1
+        word_freq = Counter(chain.from_iterable(sentences))
         
-        idf_values = {}
         total_sentences = len(sentences)
-        for word, freq in word_freq.items():
-            idf_values[word] = math.log(total_sentences / (1 + freq))
-        
-        sentence_scores = {}
-        for i, sentence in enumerate(sentences):
-            score = 0
-            for word in sentence:
-                if word in idf_values:
-                    score += idf_values[word]
-            sentence_scores[i] = score / len(sentence) if sentence else 0
+        idf_values = {word: math.log(total_sentences / (1 + freq)) for word, freq in word_freq.items()}
         
-        return sentence_scores
+        # Every word has an IDF value, so each sentence score is a C-level sum over lookups
+        return [
+            sum(map(idf_values.__getitem__, sentence)) / len(sentence) if sentence else 0
+            for sentence in sentences
+        ]
     
     def summarize(self, text, num_sentences=5):
         """Generate summary from text"""
@@ -205,8 +334,8 @@ class FreeTextSummarizer:
             sentence_scores = self.calculate_sentence_scores(preprocessed_sentences)
             top_sentences = heapq.nlargest(
                 num_sentences, 
-                sentence_scores, 
-                key=sentence_scores.get
+                range(len(sentence_scores)), 
+                key=sentence_scores.__getitem__
             )
             summary_sentences = [sentences[i] for i in sorted(top_sentences)]
             return " ".join(summary_sentences)
@@ -218,98 +347,247 @@ class FreeTextSummarizer:
 class NewsBot(discord.Client):
     def __init__(self, *args, user_settings, **kwargs):
         super().__init__(*args, **kwargs)
-        self.posted_articles = self.load_posted_articles()
+        self.db = self.open_state_db()
+        # Filled lazily from lookups; the full table is never loaded
+        self.posted_articles = OrderedDict()
         self.posted_titles = self.load_posted_titles()
-        self.channel_id = int(os.getenv('CHANNEL_ID'))
+        self._titles_by_len = self.build_title_index(self.posted_titles)
+        # (timestamp, title) pairs in posting order so expiry only touches old entries
+        self.title_expiry_queue = deque(sorted(
+            (timestamp, title) for title, timestamp in self.posted_titles.items()
+        ))
+        # A webhook URL posts over plain HTTP and skips the gateway connection entirely
+        self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+        self.channel_id = None if self.webhook_url else int(os.getenv('CHANNEL_ID'))
+        self.channel = None
         self.session = None
+        self.page_semaphore = None  # Limits concurrent article page fetches
+        self.send_queue = None  # Article embeds waiting to be posted
+        self.sender_task = None
+        self.unsent_articles = 0  # Queued or in-flight articles not yet handed to Discord
+        self.feed_validators = {}  # feed URL -> (ETag, Last-Modified)
         self.next_fetch_time = datetime.now()
         self.fetch_interval = 300  # 5 minutes
         self.title_similarity_threshold = 0.85
+        self.update_similarity_threshold = 0.7
         self.summarization_enabled = True
         self.summarizer = FreeTextSummarizer()
         self.user_settings = user_settings
         self.timezone = pytz.timezone(user_settings['timezone'])
         self.debug_mode = True  # Enable debug logging for time conversion
 
-    def load_posted_articles(self):
-        """Load posted articles from file"""
+    def open_state_db(self):
+        """Open the state database, creating tables and importing old JSON files on first run"""
+        is_new = not os.path.exists(STATE_DB_FILE)
+        db = sqlite3.connect(STATE_DB_FILE, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync stays consistent after a crash without an fsync per commit
+        db.execute("PRAGMA synchronous=NORMAL")
+        # seen is when the URL was last found in a feed; pruning keeps the most recently seen
+        db.execute("CREATE TABLE IF NOT EXISTS posted_urls (hash BLOB PRIMARY KEY, seen REAL)")
+        db.execute("CREATE INDEX IF NOT EXISTS posted_urls_seen ON posted_urls (seen)")
+        db.execute("CREATE TABLE IF NOT EXISTS posted_titles (norm TEXT PRIMARY KEY, ts REAL)")
+        if is_new:
+            self.import_legacy_state(db)
+        return db
+
+    def import_legacy_state(self, db):
+        """Copy posted_articles.json / posted_titles.json into the state database"""
         try:
             if os.path.exists('posted_articles.json'):
                 with open('posted_articles.json', 'r') as f:
-                    return set(json.load(f))
+                    entries = json.load(f)
+                # Older files stored URLs normalized by the old rules; renormalize and hash
+                # them so they match the digests of live lookups
+                now = time.time()
+                rows = []
+                for entry in entries:
+                    try:
+                        entry = self.normalize_url(entry)
+                    except ValueError:
+                        pass
+                    rows.append((self.url_digest(entry), now))
+                db.executemany("INSERT OR IGNORE INTO posted_urls (hash, seen) VALUES (?, ?)", rows)
+                logger.info(f"Imported {len(entries)} posted articles from posted_articles.json")
+            if os.path.exists('posted_titles.json'):
+                with open('posted_titles.json', 'r') as f:
+                    titles = json.load(f)
+                # Older files stored ISO timestamps; convert them to epoch seconds once
+                db.executemany(
+                    "INSERT OR REPLACE INTO posted_titles (norm, ts) VALUES (?, ?)",
+                    ((title, pytz.utc.localize(datetime.fromisoformat(timestamp)).timestamp()
+                      if isinstance(timestamp, str) else timestamp)
+                     for title, timestamp in titles.items())
+                )
+                logger.info(f"Imported {len(titles)} posted titles from posted_titles.json")
         except Exception as e:
-            logger.error(f"Error loading posted articles: {str(e)}")
-        return set()
+            logger.error(f"Error importing legacy state: {str(e)}")
+
+    def is_posted_article(self, article_key, now):
+        """Check the recent-article cache, then the state database, for a posted article"""
+        # The cache holds when each fingerprint's row was last refreshed
+        last_seen = self.posted_articles.get(article_key)
+        if last_seen is not None:
+            self.posted_articles.move_to_end(article_key)
+            if now - last_seen < POSTED_ARTICLE_REFRESH_SECONDS:
+                return True
+        try:
+            # Still in the feed, so mark it seen to keep it from being pruned
+            found = self.db.execute(
+                "UPDATE posted_urls SET seen = ? WHERE hash = ?", (now, article_key)
+            ).rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Error looking up posted article: {str(e)}")
+            return last_seen is not None
+        if found:
+            self.cache_posted_article(article_key, now)
+        return found or last_seen is not None
+
+    def cache_posted_article(self, article_key, seen):
+        """Remember a posted article in the in-memory LRU cache"""
+        self.posted_articles[article_key] = seen
+        self.posted_articles.move_to_end(article_key)
+        if len(self.posted_articles) > POSTED_ARTICLE_CACHE_SIZE:
+            self.posted_articles.popitem(last=False)
 
-    def save_posted_articles(self):
-        """Save posted articles to file"""
+    def count_posted_articles(self):
+        """Number of posted article fingerprints in the state database"""
         try:
-            with open('posted_articles.json', 'w') as f:
-                json.dump(list(self.posted_articles), f)
-        except Exception as e:
-            logger.error(f"Error saving posted articles: {str(e)}")
+            return self.db.execute("SELECT COUNT(*) FROM posted_urls").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Error counting posted articles: {str(e)}")
+        return 0
+
+    def add_posted_article(self, article_key, now):
+        """Record a posted article in memory and in the state database"""
+        self.cache_posted_article(article_key, now)
+        try:
+            self.db.execute("INSERT OR REPLACE INTO posted_urls (hash, seen) VALUES (?, ?)", (article_key, now))
+        except sqlite3.Error as e:
+            logger.error(f"Error saving posted article: {str(e)}")
+
+    def prune_posted_articles(self):
+        """Delete all but the most recently seen posted article fingerprints from the state database"""
+        try:
+            self.db.execute(
+                "DELETE FROM posted_urls WHERE seen < "
+                "(SELECT seen FROM posted_urls ORDER BY seen DESC LIMIT 1 OFFSET ?)",
+                (MAX_POSTED_ARTICLES - 1,)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error pruning posted articles: {str(e)}")
             
+    def url_digest(self, url):
+        """Compact 8-byte fingerprint of a normalized URL"""
+        return hashlib.blake2b(url.encode(), digest_size=8).digest()
+
     def load_posted_titles(self):
-        """Load posted titles from file"""
+        """Load posted titles from the state database"""
         try:
-            if os.path.exists('posted_titles.json'):
-                with open('posted_titles.json', 'r') as f:
-                    return json.load(f)
-        except Exception as e:
+            return dict(self.db.execute("SELECT norm, ts FROM posted_titles"))
+        except sqlite3.Error as e:
             logger.error(f"Error loading posted titles: {str(e)}")
         return {}
 
-    def save_posted_titles(self):
-        """Save posted titles to file"""
+    def build_title_index(self, titles):
+        """Group titles by length so lookups only scan nearby lengths"""
+        index = defaultdict(dict)
+        for title, timestamp in titles.items():
+            index[len(title)][title] = timestamp
+        return index
+
+    def add_posted_title(self, normalized_title, timestamp):
+        """Record a posted title in the store, the length index and the state database"""
+        self.posted_titles[normalized_title] = timestamp
+        self._titles_by_len[len(normalized_title)][normalized_title] = timestamp
+        self.title_expiry_queue.append((timestamp, normalized_title))
         try:
-            with open('posted_titles.json', 'w') as f:
-                json.dump(self.posted_titles, f)
-        except Exception as e:
-            logger.error(f"Error saving posted titles: {str(e)}")
-            
-    def normalize_title(self, title):
-        """Normalize title for similarity comparison"""
-        title = title.lower()
-        title = title.translate(str.maketrans('', '', string.punctuation))
-        title = re.sub(r'\s+', ' ', title).strip()
-        stop_words = {"the", "a", "an", "in", "on", "at", "to", "for", "with", "and", "but", "or"}
-        words = [word for word in title.split() if word not in stop_words]
-        return " ".join(words)
-    
-    def is_similar_title(self, new_title):
-        """Check if a title is similar to any previously posted titles"""
-        normalized_new = self.normalize_title(new_title)
-        
-        cutoff = datetime.utcnow() - timedelta(hours=24)
-        expired_titles = [title for title, timestamp in self.posted_titles.items() 
-                         if datetime.fromisoformat(timestamp) < cutoff]
-        for title in expired_titles:
+            self.db.execute(
+                "INSERT OR REPLACE INTO posted_titles (norm, ts) VALUES (?, ?)",
+                (normalized_title, timestamp)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error saving posted title: {str(e)}")
+
+    def expire_old_titles(self):
+        """Drop titles posted more than 24 hours ago"""
+        cutoff = time.time() - 24 * 60 * 60
+        queue = self.title_expiry_queue
+        while queue and queue[0][0] < cutoff:
+            timestamp, title = queue.popleft()
+            # Skip stale queue entries for titles that were posted again later
+            if self.posted_titles.get(title) != timestamp:
+                continue
             del self.posted_titles[title]
+            bucket = self._titles_by_len[len(title)]
+            del bucket[title]
+            if not bucket:
+                del self._titles_by_len[len(title)]
+        try:
+            self.db.execute("DELETE FROM posted_titles WHERE ts < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.error(f"Error expiring posted titles: {str(e)}")
+
+    def iter_titles_near_length(self, length, window=15):
+        """Yield (title, timestamp) pairs whose length is within window"""
+        for bucket_len in range(length - window, length + window + 1):
+            bucket = self._titles_by_len.get(bucket_len)
+            if bucket:
+                yield from bucket.items()
+
+    def classify_title(self, normalized_new):
+        """Classify a normalized title as 'duplicate', 'update' or 'new' against posted titles"""
+        # Exact repeats are the common case and need no fuzzy matching
+        if normalized_new in self.posted_titles:
+            return 'duplicate'
         
-        for existing_title in self.posted_titles:
-            if abs(len(normalized_new) - len(existing_title)) > 15:
-                continue
-                
-            seq = difflib.SequenceMatcher(None, normalized_new, existing_title)
-            ratio = seq.ratio()
-            
-            if ratio >= self.title_similarity_threshold:
-                return True
-                
-        return False
+        # One pass finds the closest title within 15 characters of the new one
+        candidates = [title for title, _ in self.iter_titles_near_length(len(normalized_new))]
+        match = process.extractOne(
+            normalized_new,
+            candidates,
+            scorer=fuzz.ratio,
+            score_cutoff=self.update_similarity_threshold * 100
+        )
+        if match is None:
+            return 'new'
+        if match[1] >= self.title_similarity_threshold * 100:
+            return 'duplicate'
+        return 'update'
 
     async def async_fetch_feed(self, url):
-        """Fetch RSS feed asynchronously"""
+        """Fetch RSS feed asynchronously, skipping the download if it has not changed"""
+        headers = {}
+        etag, last_modified = self.feed_validators.get(url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
         try:
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("📭 Feed unchanged since last check")
+                    return None
                 if response.status == 200:
-                    xml = await response.text()
-                    return feedparser.parse(xml)
+                    # Raw bytes let the parser detect the encoding from the XML declaration
+                    xml = await response.read()
+                    # Parse in a worker thread so the heartbeat keeps running
+                    loop = asyncio.get_running_loop()
+                    feed = await loop.run_in_executor(None, parse_feed, xml)
+                    # Only remember this version once it has been read and parsed, so a
+                    # failed download is fetched again instead of answered with a 304
+                    self.feed_validators[url] = (
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified')
+                    )
+                    return feed
+                logger.warning(f"Failed to fetch feed: HTTP {response.status}")
         except Exception as e:
             logger.warning(f"Failed to fetch feed: {str(e)}")
         return None
 
-    def generate_summary(self, text):
+    async def generate_summary(self, text):
         """Generate free summary of text"""
         if not self.summarization_enabled or not text:
             return None
@@ -317,7 +595,9 @@ class NewsBot(discord.Client):
         if len(text.split()) < 50:
             return None
             
-        summary = self.summarizer.summarize(text)
+        # Tokenizing and scoring is CPU work; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        summary = await loop.run_in_executor(None, self.summarizer.summarize, text)
         if summary and len(summary) < len(text) * 0.7:
             return summary
             
@@ -325,9 +605,17 @@ class NewsBot(discord.Client):
     
     def normalize_url(self, url):
         """Normalize URL to prevent duplicates"""
-        url = re.sub(r'[\?&](utm_|source|fbclid|ref|igshid)=[^&#]+', '', url)
-        url = url.rstrip('/').split('#')[0]
-        return url
+        parts = urlsplit(url)
+        # Filter raw key=value pairs so the remaining parameters keep their original encoding
+        query = '&'.join(
+            param for param in parts.query.split('&')
+            if param and not self.is_tracking_param(param.partition('=')[0])
+        )
+        return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), query, ''))
+
+    def is_tracking_param(self, key):
+        """Check whether a query parameter only tracks where the click came from"""
+        return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
 
     def get_description(self, entry):
         """Extract and clean description"""
@@ -343,37 +631,30 @@ class NewsBot(discord.Client):
 
     def clean_html(self, text):
         """Remove HTML tags"""
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text).strip()[:1000]
+        if len(text) > MAX_DESCRIPTION_HTML:
+            text = DANGLING_TAG_RE.sub('', text[:MAX_DESCRIPTION_HTML])
+        return HTML_TAG_RE.sub('', text).strip()[:1000]
     
     async def get_actual_publication_time(self, url):
-        """Fetch the actual publication time from the article page"""
+        """Fetch the actual publication time from the head of the article page"""
         try:
-            async with self.session.get(url) as response:
+            async with self.page_semaphore, self.session.get(url) as response:
                 if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    # Publication <time>/<meta> tags sit near the top, so only read the first 64 KB
+                    chunks = []
+                    size = 0
+                    async for chunk in response.content.iter_chunked(8192):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= PAGE_HEAD_BYTES:
+                            break
+                    page = b''.join(chunks).decode(response.charset or 'utf-8', errors='replace')
                     
-                    # Look for the publication time in the article
-                    time_tag = soup.find('time')
-                    if time_tag and time_tag.has_attr('datetime'):
-                        return time_tag['datetime']
-                    
-                    # Alternative location for publication time
-                    meta_published = soup.find('meta', property='article:published_time')
-                    if meta_published and meta_published.has_attr('content'):
-                        return meta_published['content']
-                    
-                    # Another possible location
-                    meta_date = soup.find('meta', property='og:article:published_time')
-                    if meta_date and meta_date.has_attr('content'):
-                        return meta_date['content']
-                    
-                    # Look for date in the content
-                    date_pattern = r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z?)'
-                    match = re.search(date_pattern, html)
-                    if match:
-                        return match.group(1)
+                    # Try <time datetime>, the published_time meta tags, then any ISO date
+                    for pattern in PUBLICATION_TIME_PATTERNS:
+                        match = pattern.search(page)
+                        if match:
+                            return match.group(1)
                     
         except Exception as e:
             logger.error(f"Error fetching publication time: {str(e)}")
@@ -381,66 +662,18 @@ class NewsBot(discord.Client):
 
     def format_datetime(self, dt_str):
         """Parse and convert time to user's timezone"""
-        try:
-            # First try RFC 2822 format
-            dt = parsedate_to_datetime(dt_str)
-        except (ValueError, TypeError):
-            try:
-                # Then try ISO 8601 format
-                dt = datetime.fromisoformat(dt_str)
-            except (ValueError, TypeError):
-                try:
-                    # Finally use universal parser
-                    dt = dateutil.parser.parse(dt_str)
-                except Exception:
-                    # If all parsing fails, return original string
-                    if self.debug_mode:
-                        logger.warning(f"Could not parse date: {dt_str}")
-                    return dt_str
-        
-        # Ensure datetime is in UTC
-        if dt.tzinfo is None:
-            dt = pytz.utc.localize(dt)
-        else:
-            dt = dt.astimezone(pytz.utc)
+        dt = parse_datetime(dt_str)
+        if dt is None:
+            # If all parsing fails, return original string
+            if self.debug_mode:
+                logger.warning(f"Could not parse date: {dt_str}")
+            return dt_str
         
         # Convert to user's local timezone
-        local_dt = dt.astimezone(self.timezone)
-        
-        # Get timezone abbreviation (EDT/EST)
-        tz_abbr = local_dt.strftime('%Z')
-        
-        # Format: YYYY-MM-DD HH:MM:SS TZ
-        return f"{local_dt.strftime('%Y-%m-%d %H:%M:%S')} {tz_abbr}"
+        return dt.astimezone(self.timezone).strftime(PUBLISHED_TIME_FORMAT)
     
-    def is_update(self, title):
-        """Check if this article is an update to a previously posted article"""
-        normalized_new = self.normalize_title(title)
-        
-        # Look for similar titles in the past 7 days
-        cutoff = datetime.utcnow() - timedelta(days=7)
-        
-        for existing_title, timestamp in self.posted_titles.items():
-            # Skip if too old
-            if datetime.fromisoformat(timestamp) < cutoff:
-                continue
-                
-            # Skip titles that are too different in length
-            if abs(len(normalized_new) - len(existing_title)) > 15:
-                continue
-                
-            # Calculate similarity ratio
-            seq = difflib.SequenceMatcher(None, normalized_new, existing_title)
-            ratio = seq.ratio()
-            
-            # Consider it an update if highly similar but not identical
-            if 0.7 <= ratio < 0.95:
-                return True
-                
-        return False
-
     def display_intro(self):
-        """Display enhanced professional ASCII art intro with color and animations"""
+        """Display enhanced professional ASCII art intro with color and optional animations"""
         intro_art = r"""
   ██████  ██████   ██████  ██    ██ ███    ██ ██████      ███    ██ ███████ ██     ██ ███████ 
  ██       ██   ██ ██    ██ ██    ██ ████   ██ ██   ██     ████   ██ ██      ██     ██ ██      
@@ -449,231 +682,372 @@ class NewsBot(discord.Client):
  ██████  ██   ██  ██████   ██████  ██   ████ ██████      ██   ████ ███████  ███ ███  ███████ 
         """
         
-        # Typewriter effect for ASCII art
-        print(Fore.GREEN + "\n")
-        for line in intro_art.split('\n'):
-            print(Fore.GREEN + line)
-            time.sleep(0.05)
+        # Each piece of the intro is paired with the pause that follows it when animating
+        segments = [(Fore.GREEN + "\n\n", 0)]
+        segments += [(Fore.GREEN + line + "\n", 0.05) for line in intro_art.split('\n')]
         
-        # Animated header
-        time.sleep(0.5)
-        print(Fore.YELLOW + "=" * 60)
-        time.sleep(0.2)
-        print(Fore.CYAN + "GROUND NEWS DISCORD BOT".center(60))
-        time.sleep(0.2)
-        print(Fore.LIGHTBLUE_EX + "Professional News Aggregation Solution".center(60))
-        time.sleep(0.2)
-        print(Fore.YELLOW + "=" * 60)
-        time.sleep(0.5)
+        # Header
+        segments += [
+            ("", 0.5),
+            (Fore.YELLOW + "=" * 60 + "\n", 0.2),
+            (Fore.CYAN + "GROUND NEWS DISCORD BOT".center(60) + "\n", 0.2),
+            (Fore.LIGHTBLUE_EX + "Professional News Aggregation Solution".center(60) + "\n", 0.2),
+            (Fore.YELLOW + "=" * 60 + "\n", 0.5),
+        ]
         
         # Personalized welcome
         if self.user_settings:
-            print(Fore.LIGHTMAGENTA_EX + f"\nWelcome back, {self.user_settings['name']}!".center(60))
-            print(Fore.LIGHTMAGENTA_EX + f"Your personalized news hub is ready".center(60))
-            time.sleep(0.5)
-            print(Fore.LIGHTBLUE_EX + f"Timezone: {self.user_settings['timezone']}".center(60))
-            time.sleep(0.3)
+            segments += [
+                (Fore.LIGHTMAGENTA_EX + f"\nWelcome back, {self.user_settings['name']}!".center(60) + "\n", 0),
+                (Fore.LIGHTMAGENTA_EX + f"Your personalized news hub is ready".center(60) + "\n", 0.5),
+                (Fore.LIGHTBLUE_EX + f"Timezone: {self.user_settings['timezone']}".center(60) + "\n", 0.3),
+            ]
         else:
-            print(Fore.LIGHTMAGENTA_EX + "\nWelcome to your professional news hub!".center(60))
-            time.sleep(0.5)
+            segments.append((Fore.LIGHTMAGENTA_EX + "\nWelcome to your professional news hub!".center(60) + "\n", 0.5))
         
         # System info
-        print(Fore.LIGHTWHITE_EX + "\n" + "-" * 60)
-        time.sleep(0.2)
-        print(Fore.LIGHTCYAN_EX + f"Developed by: Jordan Ilaréguy".center(60))
-        time.sleep(0.2)
-        print(Fore.LIGHTCYAN_EX + f"Version: 3.0".center(60))
-        time.sleep(0.2)
-        print(Fore.LIGHTCYAN_EX + f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(60))
-        time.sleep(0.2)
-        print(Fore.LIGHTWHITE_EX + "-" * 60)
-        time.sleep(0.5)
+        segments += [
+            (Fore.LIGHTWHITE_EX + "\n" + "-" * 60 + "\n", 0.2),
+            (Fore.LIGHTCYAN_EX + f"Developed by: Jordan Ilaréguy".center(60) + "\n", 0.2),
+            (Fore.LIGHTCYAN_EX + f"Version: 3.0".center(60) + "\n", 0.2),
+            (Fore.LIGHTCYAN_EX + f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(60) + "\n", 0.2),
+            (Fore.LIGHTWHITE_EX + "-" * 60 + "\n", 0.5),
+        ]
         
-        # System status with animation
-        print(Fore.LIGHTGREEN_EX + "\nInitializing news monitoring service" + Fore.WHITE, end='')
-        for _ in range(3):
-            print(Fore.LIGHTGREEN_EX + '.' + Fore.WHITE, end='', flush=True)
-            time.sleep(0.3)
-        print("\n")
+        # System status
+        segments.append((Fore.LIGHTGREEN_EX + "\nInitializing news monitoring service" + Fore.WHITE, 0))
+        segments += [(Fore.LIGHTGREEN_EX + '.' + Fore.WHITE, 0.3)] * 3
+        segments.append(("\n\n", 0))
         
         # Configuration details
-        print(Fore.LIGHTYELLOW_EX + f"Summarization: {'ENABLED' if self.summarization_enabled else 'DISABLED'}")
-        time.sleep(0.2)
-        print(Fore.LIGHTYELLOW_EX + f"Duplicate Threshold: {self.title_similarity_threshold}")
-        time.sleep(0.2)
-        print(Fore.LIGHTYELLOW_EX + f"Check Interval: {self.fetch_interval//60} minutes")
-        time.sleep(0.2)
-        print(Fore.LIGHTYELLOW_EX + f"Monitoring: {len(RSS_FEEDS)} news feeds\n")
-        time.sleep(0.5)
+        segments += [
+            (Fore.LIGHTYELLOW_EX + f"Summarization: {'ENABLED' if self.summarization_enabled else 'DISABLED'}\n", 0.2),
+            (Fore.LIGHTYELLOW_EX + f"Duplicate Threshold: {self.title_similarity_threshold}\n", 0.2),
+            (Fore.LIGHTYELLOW_EX + f"Check Interval: {self.fetch_interval//60} minutes\n", 0.2),
+            (Fore.LIGHTYELLOW_EX + f"Monitoring: {len(RSS_FEEDS)} news feeds\n\n", 0.5),
+        ]
+        
+        # Animations delay startup, so they only play when BOT_ANIMATIONS=1
+        if os.getenv('BOT_ANIMATIONS') == '1':
+            for text, pause in segments:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                time.sleep(pause)
+        else:
+            sys.stdout.write("".join(text for text, _ in segments))
+            sys.stdout.flush()
 
-    async def setup_hook(self):
-        # Create persistent HTTP session
+    async def start_session(self):
+        """Create the persistent HTTP session used for feeds, article pages and webhooks"""
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
         }
         timeout = aiohttp.ClientTimeout(total=30)  # Increased timeout
-        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout)
-        self.bg_task = self.loop.create_task(self.news_checker())
+        # Keep connections and DNS answers alive between 5-minute fetch cycles
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=3600, keepalive_timeout=600)
+        # trust_env picks up HTTP(S)_PROXY settings for hosts that need a proxy
+        self.session = aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout, trust_env=True)
+        self.page_semaphore = asyncio.Semaphore(8)
+        self.send_queue = asyncio.Queue()
         logger.info("News bot starting...")
-        logger.info(f"Loaded {len(self.posted_articles)} previously posted articles")
+        logger.info(f"Tracking {self.count_posted_articles()} previously posted articles")
         logger.info(f"Loaded {len(self.posted_titles)} previously posted titles")
         logger.info("Monitoring Ground News feed")
         logger.info(f"Summarization: {'ENABLED' if self.summarization_enabled else 'DISABLED'}")
+        if self.summarization_enabled:
+            # Load the Punkt model now instead of while formatting the first articles
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, self.summarizer.summarize,
+                "The news bot is starting up. This warms up the sentence tokenizer and stemmer."
+            )
+
+    async def setup_hook(self):
+        await self.start_session()
+        self.bg_task = self.loop.create_task(self.news_checker())
+
+    async def run_webhook(self):
+        """Run the news loop posting through the webhook, without logging in to the gateway"""
+        await self.start_session()
+        logger.info("Posting through Discord webhook")
+        try:
+            await self.news_checker()
+        finally:
+            await self.close()
+
+    def collect_new_entries(self, feed):
+        """Return (entry, title, url, key) for feed entries whose URL has not been posted, oldest first"""
+        candidates = []
+        seen = set()
+        now = time.time()
+        # Last-seen refreshes for the whole feed go into one transaction
+        self.db.execute("BEGIN")
+        try:
+            for entry in reversed(feed.entries):
+                article_url = entry.get('link', '')
+                title = entry.get('title', 'No title')[:250]
+                
+                if not article_url:
+                    logger.warning(f"⚠️ Article missing link: {title}")
+                    continue
+                    
+                # Normalize URL
+                try:
+                    article_url = self.normalize_url(article_url)
+                except ValueError as e:
+                    logger.warning(f"⚠️ Article has malformed link {article_url!r}: {title} ({str(e)})")
+                    continue
+                article_key = self.url_digest(article_url)
+                    
+                # Skip duplicates
+                if self.is_posted_article(article_key, now):
+                    logger.info(f"⏩ Skipping duplicate URL: {title[:60]}...")
+                    continue
+                if article_key in seen:
+                    logger.info(f"⏩ Skipping duplicate URL: {title[:60]}...")
+                    continue
+                
+                seen.add(article_key)
+                candidates.append((entry, title, article_url, article_key))
+        finally:
+            self.db.execute("COMMIT")
+        return candidates
+
+    def filter_similar(self, candidates):
+        """Drop candidates with similar titles and record the rest as posted"""
+        accepted = []
+        now = time.time()
+        # Record the whole batch in one transaction instead of one commit per row
+        self.db.execute("BEGIN")
+        try:
+            for entry, title, article_url, article_key in candidates:
+                # Skip duplicates based on title similarity; close-but-different titles are updates
+                normalized_title = normalize_title(title)
+                status = self.classify_title(normalized_title)
+                if status == 'duplicate':
+                    logger.info(f"⏩ Skipping similar title: {title[:60]}...")
+                    continue
+                is_update = status == 'update'
+                
+                # Add to posted articles
+                self.add_posted_article(article_key, now)
+                self.add_posted_title(normalized_title, now)
+                accepted.append((entry, title, article_url, is_update))
+        finally:
+            self.db.execute("COMMIT")
+        return accepted
+
+    async def format_article(self, entry, title, article_url, is_update):
+        """Build the Discord embed for an article"""
+        message = ""
+        
+        # Use the feed's timestamps; only fetch the article page when it has none
+        try:
+            if 'published' in entry:
+                pub_date = self.format_datetime(entry.published)
+                message += f"🗓️ *Published: {pub_date}*\n\n"
+            elif 'updated' in entry:
+                pub_date = self.format_datetime(entry.updated)
+                message += f"🗓️ *Updated: {pub_date}*\n\n"
+            else:
+                actual_pub_time = await self.get_actual_publication_time(article_url)
+                if actual_pub_time:
+                    pub_date = self.format_datetime(actual_pub_time)
+                    message += f"🗓️ *Published: {pub_date}*\n\n"
+                    
+                    # Debug log
+                    if self.debug_mode:
+                        current_time = datetime.now(self.timezone).strftime(PUBLISHED_TIME_FORMAT)
+                        logger.info(f"TIME DEBUG: Article: {title[:30]}... | Original: {actual_pub_time} -> Converted: {pub_date} | Current: {current_time}")
+                else:
+                    current_time = datetime.now(self.timezone).strftime(PUBLISHED_TIME_FORMAT)
+                    message += f"🗓️ *Published: {current_time}*\n\n"
+        except Exception as e:
+            logger.error(f"⚠️ Time processing error: {str(e)}")
+            current_time = datetime.now(self.timezone).strftime(PUBLISHED_TIME_FORMAT)
+            message += f"🗓️ *Published: {current_time}*\n\n"
+        
+        # Get article content
+        article_content = self.get_description(entry)
+        
+        # Add expanded summary
+        if article_content:
+            summary = await self.generate_summary(article_content)
+            if summary:
+                message += "**📝 DETAILED SUMMARY**\n"
+                message += f"{summary}\n\n"
+            else:
+                message += f"{article_content[:500]}...\n\n"
+        
+        # Add the article URL
+        message += f"[Read more]({article_url})"
+        
+        embed = discord.Embed(
+            title=title,
+            url=article_url,
+            description=message,
+            colour=discord.Colour.orange() if is_update else discord.Colour.red()
+        )
+        embed.set_author(name="🔄 UPDATE TO PREVIOUS NEWS" if is_update else "🚨 BREAKING NEWS")
+        return embed
+
+    async def send_queued_articles(self):
+        """Post queued article embeds in order, grouping as many as fit into each message"""
+        # discord.py's rate limiter (or the webhook bucket headers) paces the requests
+        held = None
+        while True:
+            batch = [held if held is not None else await self.send_queue.get()]
+            held = None
+            batch_length = len(batch[0])
+            while len(batch) < MAX_EMBEDS_PER_MESSAGE and not self.send_queue.empty():
+                embed = self.send_queue.get_nowait()
+                if batch_length + len(embed) > MAX_EMBED_CHARS:
+                    held = embed
+                    break
+                batch.append(embed)
+                batch_length += len(embed)
+            await self.send_batch(batch)
+            self.unsent_articles -= len(batch)
+            for _ in batch:
+                self.send_queue.task_done()
+
+    async def send_batch(self, batch):
+        """Send one or more article embeds as a single message"""
+        try:
+            await self.post_message(embeds=batch)
+            if len(batch) == 1:
+                logger.info(f"✅ Posted: {batch[0].title[:60]}...")
+            else:
+                logger.info(f"✅ Posted {len(batch)} articles in one message")
+        except discord.HTTPException as e:
+            if len(batch) == 1:
+                logger.error(f"❌ Error sending article: {str(e)}")
+                return
+            # One rejected embed fails the whole message; resend singly so only that one is lost
+            logger.warning(f"⚠️ Batch of {len(batch)} articles rejected, sending individually: {str(e)}")
+            for embed in batch:
+                await self.send_batch([embed])
+        except Exception as e:
+            logger.error(f"❌ Error sending articles: {str(e)}")
 
     async def news_checker(self):
-        await self.wait_until_ready()
-        channel = self.get_channel(self.channel_id)
-        if not channel:
-            logger.error(f"Channel {self.channel_id} not found!")
-            return
+        if not self.webhook_url:
+            await self.wait_until_ready()
+            self.channel = self.get_channel(self.channel_id)
+            if not self.channel:
+                logger.error(f"Channel {self.channel_id} not found!")
+                return
+        
+        # Posting runs in its own task so Discord rate limits never hold up the next fetch
+        self.sender_task = asyncio.create_task(self.send_queued_articles())
             
-        await channel.send("📰 **Ground News Bot Activated!** Monitoring news feed...")
+        await self.post_message("📰 **Ground News Bot Activated!** Monitoring news feed...")
         
         while not self.is_closed():
             try:
-                self.next_fetch_time = datetime.now() + timedelta(seconds=self.fetch_interval)
                 logger.info("Starting news feed check...")
                 print("\n[Status] Fetching latest news...")
                 
                 new_count = 0
                 
-                for source, url in RSS_FEEDS.items():
-                    feed = await self.async_fetch_feed(url)
-                    if not feed or not feed.entries:
+                # Forget titles older than 24 hours and cap stored URLs once per cycle
+                self.expire_old_titles()
+                self.prune_posted_articles()
+                
+                # Fetch every feed concurrently, then process them in order
+                feeds = await asyncio.gather(
+                    *(self.async_fetch_feed(url) for url in RSS_FEEDS.values()),
+                    return_exceptions=True
+                )
+                
+                for source, feed in zip(RSS_FEEDS, feeds):
+                    if isinstance(feed, Exception):
+                        logger.warning(f"⚠️ Failed to fetch {source}: {str(feed)}")
+                        continue
+                    if not feed:
+                        continue
+                    if not feed.entries:
                         logger.warning(f"⚠️ Empty feed from {source}")
                         continue
                     
                     logger.info(f"📰 Found {len(feed.entries)} articles from {source}")
                     
-                    # Process from oldest to newest
-                    for entry in reversed(feed.entries):
-                        article_url = entry.get('link', '')
-                        title = entry.get('title', 'No title')[:250]
-                        
-                        if not article_url:
-                            logger.warning(f"⚠️ Article missing link: {title}")
-                            continue
-                            
-                        # Normalize URL
-                        article_url = self.normalize_url(article_url)
-                            
-                        # Skip duplicates
-                        if article_url in self.posted_articles:
-                            logger.info(f"⏩ Skipping duplicate URL: {title[:60]}...")
-                            continue
-                            
-                        # Skip duplicates based on title similarity
-                        if self.is_similar_title(title):
-                            logger.info(f"⏩ Skipping similar title: {title[:60]}...")
-                            continue
-                            
-                        # Check if this is an update to a previous article
-                        is_update = self.is_update(title)
-                        
-                        # Add to posted articles
-                        self.posted_articles.add(article_url)
-                        normalized_title = self.normalize_title(title)
-                        self.posted_titles[normalized_title] = datetime.utcnow().isoformat()
-                        new_count += 1
-                        
-                        # Format the message
-                        if is_update:
-                            message = "🔄 **UPDATE TO PREVIOUS NEWS** 🔄\n\n"
-                        else:
-                            message = "🚨 **BREAKING NEWS** 🚨\n\n"
-                            
-                        message += f"**{title}**\n\n"
-                        
-                        # Get actual publication time from article page
-                        actual_pub_time = None
-                        try:
-                            actual_pub_time = await self.get_actual_publication_time(article_url)
-                            if actual_pub_time:
-                                pub_date = self.format_datetime(actual_pub_time)
-                                message += f"🗓️ *Published: {pub_date}*\n\n"
-                                
-                                # Debug log
-                                if self.debug_mode:
-                                    current_time = datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S %Z')
-                                    logger.info(f"TIME DEBUG: Article: {title[:30]}... | Original: {actual_pub_time} -> Converted: {pub_date} | Current: {current_time}")
-                            else:
-                                # Fallback to RSS time if available
-                                if 'published' in entry:
-                                    pub_date_str = entry.published
-                                    pub_date = self.format_datetime(pub_date_str)
-                                    message += f"🗓️ *Published: {pub_date}*\n\n"
-                                elif 'updated' in entry:
-                                    pub_date_str = entry.updated
-                                    pub_date = self.format_datetime(pub_date_str)
-                                    message += f"🗓️ *Updated: {pub_date}*\n\n"
-                                else:
-                                    current_time = datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S %Z')
-                                    message += f"🗓️ *Published: {current_time}*\n\n"
-                        except Exception as e:
-                            logger.error(f"⚠️ Time processing error: {str(e)}")
-                            current_time = datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S %Z')
-                            message += f"🗓️ *Published: {current_time}*\n\n"
-                        
-                        # Get article content
-                        article_content = self.get_description(entry)
-                        
-                        # Add expanded summary
-                        if article_content:
-                            summary = self.generate_summary(article_content)
-                            if summary:
-                                message += "**📝 DETAILED SUMMARY**\n"
-                                message += f"{summary}\n\n"
-                            else:
-                                message += f"{article_content[:500]}...\n\n"
-                        
-                        # Add the article URL
-                        message += f"Read more: {article_url}"
-                        
-                        # Send message
-                        try:
-                            await channel.send(message)
-                            logger.info(f"✅ Posted: {title[:60]}...")
-                        except discord.HTTPException as e:
-                            if "Must be 2000 or fewer" in str(e):
-                                if is_update:
-                                    minimal_msg = f"🔄 **UPDATE TO PREVIOUS NEWS** 🔄\n\n**{title}**\n\nRead more: {article_url}"
-                                else:
-                                    minimal_msg = f"🚨 **BREAKING NEWS** 🚨\n\n**{title}**\n\nRead more: {article_url}"
-                                await channel.send(minimal_msg)
-                                logger.info("✅ Posted minimal version")
-                            else:
-                                logger.error(f"❌ Error sending article: {str(e)}")
-                        
-                        await asyncio.sleep(3)  # Increased pause for article processing
+                    candidates = self.collect_new_entries(feed)
+                    accepted = self.filter_similar(candidates)
+                    # Any article page lookups run concurrently; gather keeps the original order
+                    embeds = await asyncio.gather(
+                        *(self.format_article(*article) for article in accepted)
+                    )
+                    for embed in embeds:
+                        self.send_queue.put_nowait(embed)
+                    self.unsent_articles += len(embeds)
+                    new_count += len(accepted)
                 
-                logger.info(f"✅ Posted {new_count} new articles total")
-                self.save_posted_articles()
-                self.save_posted_titles()
+                logger.info(f"✅ Queued {new_count} new articles for posting")
                 
                 logger.info(f"⏱️ Next check in {self.fetch_interval//60} minutes")
                 
-                print("\n[Status] Checking complete. Next fetch countdown:")
-                for remaining in range(self.fetch_interval, 0, -1):
-                    mins, secs = divmod(remaining, 60)
-                    print(f"[Countdown] Next fetch in: {mins:02d}:{secs:02d}", end='\r')
-                    await asyncio.sleep(1)
+                self.next_fetch_time = datetime.now() + timedelta(seconds=self.fetch_interval)
+                print(f"\n[Status] Checking complete. Next fetch at {self.next_fetch_time.strftime('%H:%M:%S')}")
+                await asyncio.sleep(self.fetch_interval)
                 print("\n" + "-" * 60)
                 
             except Exception as e:
                 logger.error(f"⚠️ Critical error: {str(e)}", exc_info=True)
                 await asyncio.sleep(60)
 
+    async def post_message(self, content=None, embeds=None):
+        """Send a message to the webhook if configured, otherwise to the channel"""
+        if not self.webhook_url:
+            await self.channel.send(content, embeds=embeds or [])
+            return
+        
+        payload = {}
+        if content:
+            payload['content'] = content
+        if embeds:
+            payload['embeds'] = [embed.to_dict() for embed in embeds]
+        while True:
+            async with self.session.post(self.webhook_url, json=payload) as response:
+                reset_after = float(response.headers.get('X-RateLimit-Reset-After')
+                                    or response.headers.get('Retry-After') or 1)
+                if response.status == 429:
+                    logger.warning(f"⏳ Webhook rate limited, retrying in {reset_after:.1f}s")
+                    await asyncio.sleep(reset_after)
+                    continue
+                if response.status >= 400:
+                    body = await response.text()
+                    try:
+                        body = json.loads(body)
+                    except ValueError:
+                        pass
+                    raise discord.HTTPException(response, body)
+                # Wait out the bucket before the next post instead of hitting a 429
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    await asyncio.sleep(reset_after)
+                return
+
     async def close(self):
         """Clean up when bot closes"""
-        self.save_posted_articles()
-        self.save_posted_titles()
+        if self.sender_task:
+            # Accepted articles are already recorded as posted, so give the queue a chance to empty
+            if not self.sender_task.done():
+                try:
+                    await asyncio.wait_for(self.send_queue.join(), SHUTDOWN_SEND_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+            self.sender_task.cancel()
+            if self.unsent_articles:
+                logger.warning(f"⚠️ {self.unsent_articles} queued articles may not have been posted before shutdown")
         if self.session:
             await self.session.close()
+        self.db.close()
         print("\n" + "=" * 60)
         print("Ground News Bot shutting down...".center(60))
         print(f"Shutdown Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(60))
         print("=" * 60)
-        await super().close()
+        if not self.webhook_url:
+            await super().close()
 
 # Run the bot
 if __name__ == "__main__":
@@ -689,7 +1063,10 @@ if __name__ == "__main__":
     
     try:
         print("[Status] Starting Ground News Bot...")
-        bot.run(os.getenv('DISCORD_TOKEN'))
+        if bot.webhook_url:
+            asyncio.run(bot.run_webhook())
+        else:
+            bot.run(os.getenv('DISCORD_TOKEN'))
     except KeyboardInterrupt:
         print("\n" + "=" * 60)
         print("Bot stopped by user".center(60))